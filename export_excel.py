@@ -2,30 +2,29 @@
 """Export match data to Excel spreadsheet with tabs by decade."""
 
 import sys
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, NamedStyle, Side
 from openpyxl.utils import get_column_letter
 
 from storage.database import Database
 
+# Column letters for the fixed set of export columns, computed once
+_COL_LETTERS = tuple(get_column_letter(i) for i in range(1, 27))
 
-def create_excel_by_decade(db_path: str = "data/matches.db", output_path: str = "data/matches_by_decade.xlsx"):
-    """Create Excel spreadsheet with matches grouped by decade."""
-    db = Database(db_path)
-    matches = db.get_all_matches()
 
-    # Group matches by decade
-    decades = defaultdict(list)
-    for match in matches:
-        decade = (match.date.year // 10) * 10
-        decades[decade].append(match)
+def create_excel_by_decade(db_path: str = "data/matches.db", output_path: str = "data/matches_by_decade.xlsx"):
+    """
+    Create Excel spreadsheet with matches grouped by decade.
 
-    # Create workbook
-    wb = Workbook()
-    wb.remove(wb.active)
+    Returns a dict of match counts keyed by decade start year.
+    """
+    # Create workbook (write-only mode streams rows instead of keeping a cell grid)
+    wb = Workbook(write_only=True)
 
     # Styles
     header_font = Font(bold=True, color="FFFFFF")
@@ -38,36 +37,52 @@ def create_excel_by_decade(db_path: str = "data/matches.db", output_path: str =
         bottom=Side(style="thin"),
     )
 
+    # Register the styles once so each cell references them by name instead
+    # of building its own style combination
+    wb.add_named_style(NamedStyle(
+        name="match_header",
+        font=header_font,
+        fill=header_fill,
+        alignment=header_align,
+        border=thin_border,
+    ))
+    wb.add_named_style(NamedStyle(name="match_cell", border=thin_border))
+
     headers = ["Date", "Opposition", "Venue", "Goals For", "Goals Against", "Result", "Competition", "Season"]
     col_widths = [12, 25, 8, 10, 12, 8, 20, 12]
-
-    # Create a sheet for each decade
-    for decade in sorted(decades.keys()):
-        sheet_name = f"{decade}s"
-        ws = wb.create_sheet(title=sheet_name)
-
-        # Add headers
-        for col, (header, width) in enumerate(zip(headers, col_widths), 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_align
-            cell.border = thin_border
-            ws.column_dimensions[get_column_letter(col)].width = width
-
-        # Add match data
-        for row, match in enumerate(sorted(decades[decade], key=lambda x: x.date), 2):
-            ws.cell(row=row, column=1, value=match.date.strftime("%Y-%m-%d")).border = thin_border
-            ws.cell(row=row, column=2, value=match.opposition).border = thin_border
-            ws.cell(row=row, column=3, value=match.venue).border = thin_border
-            ws.cell(row=row, column=4, value=match.goals_for).border = thin_border
-            ws.cell(row=row, column=5, value=match.goals_against).border = thin_border
-            ws.cell(row=row, column=6, value=match.result).border = thin_border
-            ws.cell(row=row, column=7, value=match.competition).border = thin_border
-            ws.cell(row=row, column=8, value=match.season).border = thin_border
-
-        # Freeze header row
-        ws.freeze_panes = "A2"
+    columns = ["date", "opposition", "venue", "goals_for", "goals_against", "result", "competition", "season"]
+
+    decades = {}
+    with Database(db_path) as db:
+        # Rows arrive in date order, so each decade is one contiguous group
+        for decade, rows in groupby(db.iter_matches_by_decade(), key=itemgetter("decade")):
+            sheet_name = f"{decade}s"
+            ws = wb.create_sheet(title=sheet_name)
+
+            # Column widths and frozen panes must be set before rows are written
+            for letter, width in zip(_COL_LETTERS, col_widths):
+                ws.column_dimensions[letter].width = width
+            ws.freeze_panes = "A2"
+
+            # Add headers
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.style = "match_header"
+                header_cells.append(cell)
+            ws.append(header_cells)
+
+            # Add match data
+            count = 0
+            for row in rows:
+                row_cells = []
+                for column in columns:
+                    cell = WriteOnlyCell(ws, value=row[column])
+                    cell.style = "match_cell"
+                    row_cells.append(cell)
+                ws.append(row_cells)
+                count += 1
+            decades[decade] = count
 
     wb.save(output_path)
     return decades
@@ -81,10 +96,10 @@ def main():
 
     decades = create_excel_by_decade(output_path=output_path)
 
-    total = sum(len(matches) for matches in decades.values())
+    total = sum(decades.values())
     print(f"Created {output_path} with {len(decades)} decade tabs ({total} matches)")
-    for decade in sorted(decades.keys()):
-        print(f"  {decade}s: {len(decades[decade])} matches")
+    for decade, count in decades.items():
+        print(f"  {decade}s: {count} matches")
 
 
 if __name__ == "__main__":
@@ -3,9 +3,11 @@
 
 import argparse
 import csv
-import json
 import logging
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from pathlib import Path
 
 from models.match import Match
@@ -13,7 +15,8 @@ from scrapers.football_data import FootballDataScraper
 from scrapers.statto import StattoScraper
 from scrapers.transfermarkt import TransfermarktScraper
 from storage.database import Database
-from utils.http_client import HttpClient
+from utils.http_client import HttpClient, create_session
+from utils.json_utils import dumps_bytes
 from utils.season_utils import format_season
 
 # Configure logging
@@ -27,35 +30,49 @@ logger = logging.getLogger(__name__)
 class ScrapeController:
     """Orchestrates scraping from multiple sources."""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, cache_dir: str | Path | None = None):
         self.db = db
-        self.http_client = HttpClient(rate_limit=2.0)
+
+        # One connection pool shared by every scraper; each client keeps its
+        # own rate limit for its source. Fetched pages are cached in cache_dir.
+        session = create_session()
+
+        def client(rate_limit: float) -> HttpClient:
+            return HttpClient(rate_limit=rate_limit, session=session, cache_dir=cache_dir)
+
+        self.http_client = client(2.0)
 
         # Initialize scrapers with source priority
         # Lower years use earlier sources in the list
         self.scrapers = [
-            StattoScraper(HttpClient(rate_limit=2.0)),
-            TransfermarktScraper(HttpClient(rate_limit=3.0)),
-            FootballDataScraper(HttpClient(rate_limit=1.0)),
+            StattoScraper(client(2.0)),
+            TransfermarktScraper(client(3.0)),
+            FootballDataScraper(client(1.0)),
         ]
 
+        # Scrapers able to handle each season, in priority order, resolved once
+        first_year = min(s.MIN_SEASON for s in self.scrapers)
+        last_year = max(s.MAX_SEASON for s in self.scrapers)
+        self._scrapers_by_year: dict[int, list] = {
+            year: [s for s in self.scrapers if s.can_scrape_season(year)]
+            for year in range(first_year, last_year)
+        }
+
     def get_scraper_for_season(self, start_year: int):
         """Get the best scraper for a given season."""
-        for scraper in self.scrapers:
-            if scraper.can_scrape_season(start_year):
-                return scraper
-        return None
+        scrapers = self._scrapers_by_year.get(start_year)
+        return scrapers[0] if scrapers else None
 
-    def scrape_season(self, start_year: int, source: str | None = None) -> int:
+    def fetch_season(self, start_year: int, source: str | None = None) -> list[Match]:
         """
-        Scrape a single season.
+        Fetch a single season's matches without storing them.
 
         Args:
             start_year: Start year of the season
             source: Optional specific source to use
 
         Returns:
-            Number of matches scraped
+            Matches from the first source that returned any
         """
         season = format_season(start_year)
         logger.info(f"Scraping season {season}")
@@ -70,15 +87,15 @@ class ScrapeController:
             scraper_class = scraper_map.get(source)
             if not scraper_class:
                 logger.error(f"Unknown source: {source}")
-                return 0
+                return []
             scrapers_to_try = [scraper_class(self.http_client)]
         else:
             # Get all scrapers that can handle this season, in priority order
-            scrapers_to_try = [s for s in self.scrapers if s.can_scrape_season(start_year)]
+            scrapers_to_try = self._scrapers_by_year.get(start_year, [])
 
         if not scrapers_to_try:
             logger.warning(f"No scraper available for {season}")
-            return 0
+            return []
 
         # Try each scraper until one returns matches
         for scraper in scrapers_to_try:
@@ -86,17 +103,30 @@ class ScrapeController:
             matches = scraper.scrape_season(start_year)
 
             if matches:
-                count = 0
-                for match in matches:
-                    self.db.upsert_match(match)
-                    count += 1
-                logger.info(f"Stored {count} matches for {season} from {scraper.SOURCE_NAME}")
-                return count
+                logger.info(f"Found {len(matches)} matches for {season} from {scraper.SOURCE_NAME}")
+                return matches
             else:
                 logger.info(f"{scraper.SOURCE_NAME} returned no matches, trying next source...")
 
         logger.warning(f"No matches found for {season} from any source")
-        return 0
+        return []
+
+    def scrape_season(self, start_year: int, source: str | None = None) -> int:
+        """
+        Scrape a single season.
+
+        Args:
+            start_year: Start year of the season
+            source: Optional specific source to use
+
+        Returns:
+            Number of matches scraped
+        """
+        matches = self.fetch_season(start_year, source)
+        if matches:
+            self.db.upsert_many(matches)
+            logger.info(f"Stored {len(matches)} matches for {format_season(start_year)}")
+        return len(matches)
 
     def scrape_range(
         self, start_year: int, end_year: int, source: str | None = None
@@ -104,6 +134,13 @@ class ScrapeController:
         """
         Scrape a range of seasons.
 
+        Seasons are grouped by the source that will serve them. Each source
+        gets its own single worker thread, so its rate limit is still honoured,
+        while different sources are fetched concurrently. Each season is
+        stored as soon as it has been fetched. If a season fails (or the
+        run is interrupted), seasons not yet started are cancelled and the
+        error is raised; seasons already stored are kept.
+
         Args:
             start_year: First season start year
             end_year: Last season start year (inclusive)
@@ -112,10 +149,42 @@ class ScrapeController:
         Returns:
             Total matches scraped
         """
-        total = 0
+        groups: dict[str | None, list[int]] = defaultdict(list)
         for year in range(start_year, end_year + 1):
-            count = self.scrape_season(year, source)
-            total += count
+            if source:
+                key = source
+            else:
+                scraper = self.get_scraper_for_season(year)
+                key = scraper.SOURCE_NAME if scraper else None
+            groups[key].append(year)
+
+        def fetch(year: int) -> tuple[int, list[Match]]:
+            return year, self.fetch_season(year, source)
+
+        total = 0
+        with ExitStack() as stack:
+            executors = []
+            futures = []
+            for key, years in groups.items():
+                executor = stack.enter_context(
+                    ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"scrape-{key}")
+                )
+                executors.append(executor)
+                futures.extend(executor.submit(fetch, year) for year in years)
+
+            try:
+                for future in as_completed(futures):
+                    year, matches = future.result()
+                    if matches:
+                        # One transaction per season
+                        self.db.upsert_many(matches)
+                        logger.info(f"Stored {len(matches)} matches for {format_season(year)}")
+                    total += len(matches)
+            except BaseException:
+                # Don't fetch queued seasons only to discard them
+                for executor in executors:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
         logger.info(f"Total matches scraped: {total}")
         return total
@@ -127,9 +196,8 @@ class ScrapeController:
 
 
 def export_csv(db: Database, output_path: str) -> None:
-    """Export all matches to CSV."""
-    matches = db.get_all_matches()
-
+    """Export all matches to CSV, streaming rows from the database."""
+    count = 0
     with open(output_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow([
@@ -138,7 +206,7 @@ def export_csv(db: Database, output_path: str) -> None:
             "scorers", "lineup", "source"
         ])
 
-        for match in matches:
+        for count, match in enumerate(db.iter_matches(), 1):
             writer.writerow([
                 match.date.isoformat(),
                 match.opposition,
@@ -155,53 +223,60 @@ def export_csv(db: Database, output_path: str) -> None:
                 match.source,
             ])
 
-    logger.info(f"Exported {len(matches)} matches to {output_path}")
+    logger.info(f"Exported {count} matches to {output_path}")
 
 
 def export_json(db: Database, output_path: str) -> None:
-    """Export all matches to JSON."""
-    matches = db.get_all_matches()
-
-    data = []
-    for match in matches:
-        data.append({
-            "date": match.date.isoformat(),
-            "opposition": match.opposition,
-            "venue": match.venue,
-            "goals_for": match.goals_for,
-            "goals_against": match.goals_against,
-            "result": match.result,
-            "competition": match.competition,
-            "season": match.season,
-            "attendance": match.attendance,
-            "referee": match.referee,
-            "scorers": match.scorers,
-            "lineup": match.lineup,
-            "source": match.source,
-        })
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-    logger.info(f"Exported {len(matches)} matches to {output_path}")
+    """
+    Export all matches to JSON.
+
+    Records are written one per line as they are read, so the full list is
+    never held in memory. Uses orjson for encoding when it is installed.
+    """
+    count = 0
+    with open(output_path, "wb") as f:
+        f.write(b"[")
+        for count, match in enumerate(db.iter_matches(), 1):
+            f.write(b",\n  " if count > 1 else b"\n  ")
+            f.write(dumps_bytes({
+                "date": match.date.isoformat(),
+                "opposition": match.opposition,
+                "venue": match.venue,
+                "goals_for": match.goals_for,
+                "goals_against": match.goals_against,
+                "result": match.result,
+                "competition": match.competition,
+                "season": match.season,
+                "attendance": match.attendance,
+                "referee": match.referee,
+                "scorers": match.scorers,
+                "lineup": match.lineup,
+                "source": match.source,
+            }))
+        f.write(b"\n]\n" if count else b"]\n")
+
+    logger.info(f"Exported {count} matches to {output_path}")
 
 
 def print_stats(db: Database) -> None:
     """Print database statistics."""
     total = db.get_match_count()
-    print(f"\nTotal matches: {total}")
+    row_fmt = (
+        "{season:<12} {matches:>8} {wins:>4} {draws:>4} {losses:>4} "
+        "{scored:>5} {conceded:>5}"
+    ).format
 
-    print("\nSeason Summary:")
-    print("-" * 70)
-    print(f"{'Season':<12} {'Matches':>8} {'W':>4} {'D':>4} {'L':>4} {'GF':>5} {'GA':>5}")
-    print("-" * 70)
+    lines = [
+        f"\nTotal matches: {total}",
+        "\nSeason Summary:",
+        "-" * 70,
+        f"{'Season':<12} {'Matches':>8} {'W':>4} {'D':>4} {'L':>4} {'GF':>5} {'GA':>5}",
+        "-" * 70,
+    ]
+    lines.extend(row_fmt(**row) for row in db.get_season_summary())
 
-    for row in db.get_season_summary():
-        print(
-            f"{row['season']:<12} {row['matches']:>8} "
-            f"{row['wins']:>4} {row['draws']:>4} {row['losses']:>4} "
-            f"{row['scored']:>5} {row['conceded']:>5}"
-        )
+    # One write for the whole table rather than a print() per season
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -232,6 +307,12 @@ def main():
     scrape_parser.add_argument(
         "--db", default="data/matches.db", help="Database path"
     )
+    scrape_parser.add_argument(
+        "--cache-dir", default="data/http_cache", help="Directory for cached pages"
+    )
+    scrape_parser.add_argument(
+        "--no-cache", action="store_true", help="Always fetch pages from the network"
+    )
 
     # Export command
     export_parser = subparsers.add_parser("export", help="Export match data")
@@ -261,31 +342,32 @@ def main():
     project_dir = Path(__file__).parent
     db_path = project_dir / args.db
 
-    db = Database(db_path)
-
-    if args.command == "scrape":
-        controller = ScrapeController(db)
-
-        if args.all:
-            controller.scrape_all()
-        elif args.season:
-            controller.scrape_season(args.season, args.source)
-        elif args.start and args.end:
-            controller.scrape_range(args.start, args.end, args.source)
-        else:
-            print("Please specify --season, --start/--end, or --all")
-            return 1
+    # One connection is shared by every step of the command
+    with Database(db_path) as db:
+        if args.command == "scrape":
+            cache_dir = None if args.no_cache else project_dir / args.cache_dir
+            controller = ScrapeController(db, cache_dir=cache_dir)
+
+            if args.all:
+                controller.scrape_all()
+            elif args.season:
+                controller.scrape_season(args.season, args.source)
+            elif args.start and args.end:
+                controller.scrape_range(args.start, args.end, args.source)
+            else:
+                print("Please specify --season, --start/--end, or --all")
+                return 1
 
-        print_stats(db)
+            print_stats(db)
 
-    elif args.command == "export":
-        if args.format == "csv":
-            export_csv(db, args.output)
-        else:
-            export_json(db, args.output)
+        elif args.command == "export":
+            if args.format == "csv":
+                export_csv(db, args.output)
+            else:
+                export_json(db, args.output)
 
-    elif args.command == "stats":
-        print_stats(db)
+        elif args.command == "stats":
+            print_stats(db)
 
     return 0
 
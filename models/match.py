@@ -3,7 +3,7 @@ from datetime import date
 from typing import Literal, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Match:
     """Represents a single Southend United match."""
 
@@ -1,20 +1,56 @@
 """Base scraper class defining the interface for all scrapers."""
 
+import logging
 from abc import ABC, abstractmethod
-from typing import Iterator
+from datetime import date
+from typing import Iterator, Optional
+
+import lxml.html
+from lxml import etree
 
 from models.match import Match
 from utils.http_client import HttpClient
+from utils.season_utils import get_season_from_date, parse_season
+
+logger = logging.getLogger(__name__)
+
+# Compiled XPath shared by the HTML scrapers
+TABLES = etree.XPath("//table")
+TABLE_ROWS = etree.XPath(".//tr")
+ROW_CELLS = etree.XPath(".//td | .//th")
+
+
+def element_text(el) -> str:
+    """Element text with each text node stripped, as get_text(strip=True) did."""
+    return "".join(t.strip() for t in el.itertext())
+
+
+def exact_lookup(substring_map: dict[str, str]) -> dict[str, str]:
+    """
+    Build an exact-name lookup for a map that is scanned by substring.
+
+    Each key resolves to what the first-match substring scan would return
+    for it, so an exact hit and the scan always agree.
+    """
+    return {
+        name: next(v for k, v in substring_map.items() if k in name)
+        for name in substring_map
+    }
 
 
 class BaseScraper(ABC):
     """Abstract base class for match data scrapers."""
 
+    __slots__ = ("http_client", "_url_cache")
+
     # Override in subclasses
     SOURCE_NAME: str = "unknown"
     MIN_SEASON: int = 1900
     MAX_SEASON: int = 2100
 
+    # Cache lifetime in seconds for pages of a season still in progress
+    CURRENT_SEASON_CACHE_AGE: float = 3600
+
     def __init__(self, http_client: HttpClient | None = None):
         """
         Initialize the scraper.
@@ -23,11 +59,40 @@ class BaseScraper(ABC):
             http_client: HTTP client to use for requests. If None, creates a new one.
         """
         self.http_client = http_client or HttpClient()
+        # Season URLs built so far, for subclasses that memoize them
+        self._url_cache: dict = {}
 
     def can_scrape_season(self, start_year: int) -> bool:
         """Check if this scraper can handle the given season."""
         return self.MIN_SEASON <= start_year < self.MAX_SEASON
 
+    def _parse_page(self, html: str, season: str) -> Optional[lxml.html.HtmlElement]:
+        """
+        Parse a fetched HTML page, or return None if it has no content.
+
+        The text is parsed as UTF-8 bytes, since lxml rejects str input that
+        carries an XML encoding declaration.
+        """
+        try:
+            if html.strip():
+                parser = lxml.html.HTMLParser(encoding="utf-8")
+                return lxml.html.fromstring(html.encode("utf-8"), parser=parser)
+        except etree.ParserError:
+            pass
+        logger.warning(f"Empty page for {season} from {self.SOURCE_NAME}")
+        return None
+
+    def _cache_max_age(self, start_year: int) -> Optional[float]:
+        """
+        Get how long a fetched page for a season may be served from cache.
+
+        Finished seasons never change, so they are cached indefinitely.
+        """
+        current_start, _ = parse_season(get_season_from_date(date.today()))
+        if start_year < current_start:
+            return None
+        return self.CURRENT_SEASON_CACHE_AGE
+
     @abstractmethod
     def scrape_season(self, start_year: int) -> list[Match]:
         """
@@ -6,22 +6,33 @@ It can work with pre-fetched HTML content or integrate with Playwright.
 
 import logging
 import re
-from datetime import datetime
+from datetime import date
 from typing import Optional
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from models.match import Match
-from scrapers.base import BaseScraper
+from scrapers.base import TABLE_ROWS, BaseScraper, element_text
 from utils.http_client import HttpClient
 from utils.season_utils import format_season
 
 logger = logging.getLogger(__name__)
 
+_FIRST_TABLE = etree.XPath("(//table)[1]")
+_ROW_CELLS = etree.XPath(".//td")
+
+_SCORE_RE = re.compile(r"(\d+)-(\d+)")
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
 
 class ElevenVElevenScraper(BaseScraper):
     """Scraper for 11v11.com historical match data."""
 
+    __slots__ = ("_html_cache",)
+
     SOURCE_NAME = "11v11"
     MIN_SEASON = 1906
     MAX_SEASON = 2026
@@ -67,37 +78,41 @@ class ElevenVElevenScraper(BaseScraper):
         end_year = start_year + 1
         return f"{self.BASE_URL}/{end_year}/"
 
-    def _parse_date(self, date_str: str) -> datetime:
+    def _parse_date(self, date_str: str) -> date:
         """Parse date from 11v11 format (e.g., '16 Aug 1975')."""
-        return datetime.strptime(date_str.strip(), "%d %b %Y").date()
+        # Fixed "day month year" shape, so split instead of using strptime
+        day, month, year = date_str.split()
+        try:
+            return date(int(year), _MONTHS[month.lower()], int(day))
+        except KeyError:
+            raise ValueError(f"Cannot parse date: {date_str}") from None
 
     def _parse_score(self, score_str: str) -> tuple[int, int]:
         """Parse score string (e.g., '2-1') into home and away goals."""
         # Handle aggregate scores like "3-0 Agg: 3-2"
-        score_str = score_str.split("Agg:")[0].strip()
-        match = re.match(r"(\d+)-(\d+)", score_str)
+        score_str = score_str.split("Agg:", 1)[0].strip()
+        match = _SCORE_RE.match(score_str)
         if match:
             return int(match.group(1)), int(match.group(2))
         raise ValueError(f"Cannot parse score: {score_str}")
 
     def _normalize_competition(self, comp: str) -> str:
-        """Normalize competition name to match existing data."""
-        comp = comp.strip()
+        """Normalize an already-stripped competition name to match existing data."""
         return self.COMPETITION_MAP.get(comp, comp)
 
     def _parse_match_row(self, row, season: str) -> Optional[Match]:
         """Parse a table row into a Match object."""
-        cells = row.find_all("td")
+        cells = _ROW_CELLS(row)
         if len(cells) < 5:
             return None
 
         try:
             # Extract data from cells
-            date_str = cells[0].get_text(strip=True)
-            match_str = cells[1].get_text(strip=True)
-            result = cells[2].get_text(strip=True)  # W/D/L
-            score_str = cells[3].get_text(strip=True)
-            competition = cells[4].get_text(strip=True)
+            date_str = element_text(cells[0])
+            match_str = element_text(cells[1])
+            result = element_text(cells[2])  # W/D/L
+            score_str = element_text(cells[3])
+            competition = element_text(cells[4])
 
             # Parse date
             match_date = self._parse_date(date_str)
@@ -135,8 +150,8 @@ class ElevenVElevenScraper(BaseScraper):
             competition = self._normalize_competition(competition)
 
             # Get match URL for source tracking
-            link = cells[1].find("a")
-            source_match_id = link.get("href") if link else None
+            link = cells[1].find(".//a")
+            source_match_id = link.get("href") if link is not None else None
 
             return Match(
                 date=match_date,
@@ -176,21 +191,24 @@ class ElevenVElevenScraper(BaseScraper):
 
     def parse_html(self, html: str, season: str) -> list[Match]:
         """Parse HTML content and extract matches."""
-        soup = BeautifulSoup(html, "lxml")
         matches = []
 
         # Find the matches table
-        table = soup.find("table")
-        if not table:
+        root = self._parse_page(html, season)
+        if root is None:
+            return []
+        tables = _FIRST_TABLE(root)
+        if not tables:
             logger.warning(f"No table found for {season}")
             return []
+        table = tables[0]
 
         # Find all data rows (skip header)
-        tbody = table.find("tbody")
-        if tbody:
-            rows = tbody.find_all("tr")
+        tbody = table.find(".//tbody")
+        if tbody is not None:
+            rows = TABLE_ROWS(tbody)
         else:
-            rows = table.find_all("tr")[1:]  # Skip header row
+            rows = TABLE_ROWS(table)[1:]  # Skip header row
 
         for row in rows:
             match = self._parse_match_row(row, season)
@@ -1,13 +1,15 @@
 """Scraper for football-data.co.uk CSV files."""
 
 import csv
-import io
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import zip_longest
 from typing import Optional
 
 from models.match import Match
 from scrapers.base import BaseScraper
+from utils.date_utils import parse_dmy_date
 from utils.http_client import HttpClient
 from utils.season_utils import format_season
 
@@ -15,48 +17,59 @@ logger = logging.getLogger(__name__)
 
 
 # Southend United's division history (approximate)
-# Format: {start_year: division_code}
+# One entry per season, indexed by start_year - FootballDataScraper.MIN_SEASON (1993)
 # E0=Premier, E1=Championship, E2=League One, E3=League Two, EC=Conference
-SOUTHEND_DIVISIONS = {
-    1993: "E2",  # Division 2 (now League One)
-    1994: "E2",
-    1995: "E2",
-    1996: "E2",
-    1997: "E3",  # Relegated to Division 3
-    1998: "E3",
-    1999: "E3",
-    2000: "E3",
-    2001: "E3",
-    2002: "E3",
-    2003: "E3",
-    2004: "E3",
-    2005: "E2",  # Promoted to League One
-    2006: "E1",  # Promoted to Championship
-    2007: "E2",  # Relegated
-    2008: "E2",
-    2009: "E2",
-    2010: "E3",  # Relegated to League Two
-    2011: "E3",
-    2012: "E3",
-    2013: "E3",
-    2014: "E3",
-    2015: "E2",  # Promoted to League One
-    2016: "E2",
-    2017: "E2",
-    2018: "E2",
-    2019: "E2",
-    2020: "E3",  # Relegated to League Two
-    2021: "EC",  # Relegated to National League
-    2022: "EC",
-    2023: "EC",
-    2024: "EC",
-    2025: "EC",
+SOUTHEND_DIVISIONS = (
+    "E2",  # 1993 Division 2 (now League One)
+    "E2",  # 1994
+    "E2",  # 1995
+    "E2",  # 1996
+    "E3",  # 1997 Relegated to Division 3
+    "E3",  # 1998
+    "E3",  # 1999
+    "E3",  # 2000
+    "E3",  # 2001
+    "E3",  # 2002
+    "E3",  # 2003
+    "E3",  # 2004
+    "E2",  # 2005 Promoted to League One
+    "E1",  # 2006 Promoted to Championship
+    "E2",  # 2007 Relegated
+    "E2",  # 2008
+    "E2",  # 2009
+    "E3",  # 2010 Relegated to League Two
+    "E3",  # 2011
+    "E3",  # 2012
+    "E3",  # 2013
+    "E3",  # 2014
+    "E2",  # 2015 Promoted to League One
+    "E2",  # 2016
+    "E2",  # 2017
+    "E2",  # 2018
+    "E2",  # 2019
+    "E3",  # 2020 Relegated to League Two
+    "EC",  # 2021 Relegated to National League
+    "EC",  # 2022
+    "EC",  # 2023
+    "EC",  # 2024
+    "EC",  # 2025
+)
+
+# Division code -> competition name
+COMPETITION_MAP = {
+    "E0": "Premier League",
+    "E1": "Championship",
+    "E2": "League One",
+    "E3": "League Two",
+    "EC": "National League",
 }
 
 
 class FootballDataScraper(BaseScraper):
     """Scraper for football-data.co.uk CSV data."""
 
+    __slots__ = ()
+
     SOURCE_NAME = "football-data"
     MIN_SEASON = 1993
     MAX_SEASON = 2026
@@ -69,27 +82,24 @@ class FootballDataScraper(BaseScraper):
 
     def _get_csv_url(self, start_year: int, division: str) -> str:
         """Get the URL for a season's CSV file."""
-        # Format: mmz4281/9394/E2.csv for 1993-1994 League One
-        season_code = f"{start_year % 100:02d}{(start_year + 1) % 100:02d}"
-        return f"{self.BASE_URL}/{season_code}/{division}.csv"
+        key = (start_year, division)
+        url = self._url_cache.get(key)
+        if url is None:
+            # Format: mmz4281/9394/E2.csv for 1993-1994 League One
+            season_code = f"{start_year % 100:02d}{(start_year + 1) % 100:02d}"
+            url = self._url_cache[key] = f"{self.BASE_URL}/{season_code}/{division}.csv"
+        return url
 
     def _get_division_for_season(self, start_year: int) -> Optional[str]:
         """Get the division code for a season."""
-        return SOUTHEND_DIVISIONS.get(start_year)
-
-    def _parse_date(self, date_str: str) -> datetime:
-        """Parse date from CSV (various formats)."""
-        # Try different date formats
-        formats = [
-            "%d/%m/%Y",  # 28/08/1993
-            "%d/%m/%y",  # 28/08/93
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-        raise ValueError(f"Cannot parse date: {date_str}")
+        index = start_year - self.MIN_SEASON
+        if 0 <= index < len(SOUTHEND_DIVISIONS):
+            return SOUTHEND_DIVISIONS[index]
+        return None
+
+    def _parse_date(self, date_str: str) -> date:
+        """Parse date from CSV (e.g. '28/08/1993' or '28/08/93')."""
+        return parse_dmy_date(date_str)
 
     def _parse_match_row(
         self, row: dict, season: str
@@ -128,14 +138,7 @@ class FootballDataScraper(BaseScraper):
 
         # Get competition from division
         div = row.get("Div", "")
-        competition_map = {
-            "E0": "Premier League",
-            "E1": "Championship",
-            "E2": "League One",
-            "E3": "League Two",
-            "EC": "National League",
-        }
-        competition = competition_map.get(div, div)
+        competition = COMPETITION_MAP.get(div, div)
 
         # Optional fields
         attendance = None
@@ -161,6 +164,38 @@ class FootballDataScraper(BaseScraper):
             source_match_id=f"{match_date.isoformat()}_{opposition}",
         )
 
+    def _parse_csv(self, text: str, season: str) -> list[Match]:
+        """Parse a season CSV and return the Southend matches in it."""
+        # Only a handful of lines mention Southend, so drop the rest with a
+        # plain substring test before the csv module parses them
+        lines = text.splitlines()
+        if not lines:
+            return []
+        relevant = [line for line in lines[1:] if self.TEAM_NAME in line]
+
+        header = next(csv.reader(lines[:1]))
+        try:
+            home_idx = header.index("HomeTeam")
+            away_idx = header.index("AwayTeam")
+        except ValueError:
+            logger.warning(f"No HomeTeam/AwayTeam columns in CSV for {season}")
+            return []
+
+        matches = []
+        for row in csv.reader(relevant):
+            # Check the team columns by position before building a dict
+            if len(row) <= max(home_idx, away_idx) or (
+                self.TEAM_NAME not in row[home_idx]
+                and self.TEAM_NAME not in row[away_idx]
+            ):
+                continue
+            # Pad short rows with None, as csv.DictReader does, so they fail
+            # to parse instead of silently defaulting the missing goals to 0
+            match = self._parse_match_row(dict(zip_longest(header, row)), season)
+            if match:
+                matches.append(match)
+        return matches
+
     def scrape_season(self, start_year: int) -> list[Match]:
         """Scrape all Southend matches for a season."""
         division = self._get_division_for_season(start_year)
@@ -174,18 +209,12 @@ class FootballDataScraper(BaseScraper):
         logger.info(f"Fetching {season} from {url}")
 
         try:
-            response_text = self.http_client.get_text(url)
+            response_text = self.http_client.get_text(url, max_age=self._cache_max_age(start_year))
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return []
 
-        matches = []
-        reader = csv.DictReader(io.StringIO(response_text))
-
-        for row in reader:
-            match = self._parse_match_row(row, season)
-            if match:
-                matches.append(match)
+        matches = self._parse_csv(response_text, season)
 
         logger.info(f"Found {len(matches)} Southend matches in {season}")
         return matches
@@ -199,19 +228,26 @@ class FootballDataScraper(BaseScraper):
         """
         all_matches = []
         season = format_season(start_year)
+        urls = [
+            self._get_csv_url(start_year, division)
+            for division in ["E0", "E1", "E2", "E3", "EC"]
+        ]
 
-        for division in ["E0", "E1", "E2", "E3", "EC"]:
-            url = self._get_csv_url(start_year, division)
+        # Fetch concurrently (the client still spaces requests by its rate
+        # limit), then parse in division order
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            max_age = self._cache_max_age(start_year)
+            futures = [
+                executor.submit(self.http_client.get_text, url, max_age=max_age)
+                for url in urls
+            ]
 
+        for future in futures:
             try:
-                response_text = self.http_client.get_text(url)
+                response_text = future.result()
             except Exception:
                 continue
 
-            reader = csv.DictReader(io.StringIO(response_text))
-            for row in reader:
-                match = self._parse_match_row(row, season)
-                if match:
-                    all_matches.append(match)
+            all_matches.extend(self._parse_csv(response_text, season))
 
         return all_matches
@@ -2,22 +2,45 @@
 
 import logging
 import re
-from datetime import datetime
+from datetime import date
 from typing import Optional
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from models.match import Match
-from scrapers.base import BaseScraper
+from scrapers.base import (
+    ROW_CELLS,
+    TABLE_ROWS,
+    TABLES,
+    BaseScraper,
+    element_text,
+    exact_lookup,
+)
+from utils.date_utils import parse_dmy_date
 from utils.http_client import HttpClient
 from utils.season_utils import format_season
 
 logger = logging.getLogger(__name__)
 
+# Compiled once rather than looked up in re's cache on every row
+_DATE_RE = re.compile(r"\d{2}\.\d{2}\.\d{4}")
+_RESULT_RE = re.compile(r"[WDL]?(\d+)-(\d+)")
+_RESULT_CELL_RE = re.compile(r"[WDL]\d+-\d+", re.IGNORECASE)
+
+# First characters that can start a result or venue cell
+_RESULT_FIRST_CHARS = frozenset("WDLwdl")
+_VENUE_FIRST_CHARS = frozenset("HAha")
+_VENUE_TOKENS = frozenset(("home", "away", "h", "a"))
+
+# Only used to test for a team link, so stop at the first one
+_TEAM_LINK = etree.XPath("(.//a[contains(@href, '/teams/')])[1]")
+
 
 class StattoScraper(BaseScraper):
     """Scraper for statto.com historical match data (1909-2017)."""
 
+    __slots__ = ()
+
     SOURCE_NAME = "statto"
     MIN_SEASON = 1909
     MAX_SEASON = 2017  # Site appears to have stopped updating
@@ -56,35 +79,29 @@ class StattoScraper(BaseScraper):
 
     def _get_season_url(self, start_year: int) -> str:
         """Get the URL for a season's results."""
-        season = f"{start_year}-{start_year + 1}"
-        return f"{self.BASE_URL}/football/teams/{self.TEAM_SLUG}/{season}/results"
-
-    def _parse_date(self, date_str: str, year_hint: int) -> Optional[datetime]:
+        url = self._url_cache.get(start_year)
+        if url is None:
+            season = f"{start_year}-{start_year + 1}"
+            url = self._url_cache[start_year] = (
+                f"{self.BASE_URL}/football/teams/{self.TEAM_SLUG}/{season}/results"
+            )
+        return url
+
+    def _parse_date(self, date_str: str, year_hint: int) -> Optional[date]:
         """Parse date from statto.com format (DD.MM.YYYY)."""
         date_str = date_str.strip()
-
-        formats = [
-            "%d.%m.%Y",
-            "%d/%m/%Y",
-            "%d.%m.%y",
-            "%d/%m/%y",
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-
-        logger.warning(f"Cannot parse date: {date_str}")
-        return None
+        try:
+            return parse_dmy_date(date_str)
+        except ValueError:
+            logger.warning(f"Cannot parse date: {date_str}")
+            return None
 
     def _parse_result(self, result_str: str) -> tuple[int, int]:
         """Parse result string like 'W2-0' or 'L0-1' or 'D1-1'."""
         result_str = result_str.strip().upper()
 
         # Match pattern like W2-0, L0-1, D1-1
-        match = re.match(r"[WDL]?(\d+)-(\d+)", result_str)
+        match = _RESULT_RE.match(result_str)
         if match:
             return int(match.group(1)), int(match.group(2))
 
@@ -93,6 +110,10 @@ class StattoScraper(BaseScraper):
     def _normalize_competition(self, comp: str) -> str:
         """Normalize competition name."""
         comp_lower = comp.strip().lower()
+        # Most names match a key exactly; only scan for substrings on a miss
+        exact = _COMPETITION_EXACT.get(comp_lower)
+        if exact is not None:
+            return exact
         for key, value in self.COMPETITION_MAP.items():
             if key in comp_lower:
                 return value
@@ -106,16 +127,19 @@ class StattoScraper(BaseScraper):
         logger.info(f"Fetching {season} from statto.com")
 
         try:
-            html = self.http_client.get_text(url)
+            html = self.http_client.get_text(url, max_age=self._cache_max_age(start_year))
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return []
 
-        soup = BeautifulSoup(html, "lxml")
+        root = self._parse_page(html, season)
+        if root is None:
+            return []
+
         matches = []
 
         # Find all tables on the page
-        tables = soup.find_all("table")
+        tables = TABLES(root)
 
         for table in tables:
             table_matches = self._parse_results_table(table, season, start_year)
@@ -131,64 +155,77 @@ class StattoScraper(BaseScraper):
         matches = []
         current_competition = "Unknown"
 
-        rows = table.find_all("tr")
+        rows = TABLE_ROWS(table)
 
         for row in rows:
-            cells = row.find_all(["td", "th"])
+            cells = ROW_CELLS(row)
             if not cells:
                 continue
+            cell_texts = [element_text(c) for c in cells]
 
             # Check if this is a competition header row (single cell spanning columns)
             if len(cells) == 1:
-                comp_text = cells[0].get_text(strip=True)
+                comp_text = cell_texts[0]
                 if comp_text and not comp_text.isdigit():
                     current_competition = self._normalize_competition(comp_text)
                 continue
 
             # Check if this is a table header row
-            cell_texts = [c.get_text(strip=True).lower() for c in cells]
-            if "date" in cell_texts or "opponent" in cell_texts:
+            lowered = [text.lower() for text in cell_texts]
+            if "date" in lowered or "opponent" in lowered:
                 continue
 
             # Try to parse as match row
-            match = self._parse_match_row(cells, current_competition, season, year_hint)
+            match = self._parse_match_row(
+                cells, cell_texts, current_competition, season, year_hint
+            )
             if match:
                 matches.append(match)
 
         return matches
 
     def _parse_match_row(
-        self, cells: list, competition: str, season: str, year_hint: int
+        self,
+        cells: list,
+        cell_texts: list[str],
+        competition: str,
+        season: str,
+        year_hint: int,
     ) -> Optional[Match]:
         """
-        Parse a table row into a Match object.
+        Parse a table row (its cells and their texts) into a Match object.
 
         Expected columns: No, Date, Opponent, Venue, Result, Pos, Pt
         """
         if len(cells) < 5:
             return None
 
-        cell_texts = [cell.get_text(strip=True) for cell in cells]
-
         # Find indices by content pattern
         date_idx = None
         opponent_idx = None
+        opponent_link = None
         venue_idx = None
         result_idx = None
 
+        # Dispatch on the first character so each cell runs at most one regex,
+        # and only cells that matched nothing else are searched for a link
         for i, text in enumerate(cell_texts):
+            c0 = text[:1]
             # Date: DD.MM.YYYY pattern
-            if re.match(r"\d{2}\.\d{2}\.\d{4}", text):
+            if c0.isdigit() and _DATE_RE.match(text):
                 date_idx = i
-            # Venue: home/away
-            elif text.lower() in ("home", "away", "h", "a"):
-                venue_idx = i
             # Result: W2-0, L0-1, D1-1 pattern
-            elif re.match(r"[WDL]\d+-\d+", text, re.IGNORECASE):
+            elif c0 in _RESULT_FIRST_CHARS and _RESULT_CELL_RE.match(text):
                 result_idx = i
-            # Opponent: has a team link
-            elif cells[i].find("a", href=re.compile(r"/teams/")):
-                opponent_idx = i
+            # Venue: home/away
+            elif c0 in _VENUE_FIRST_CHARS and text.lower() in _VENUE_TOKENS:
+                venue_idx = i
+            # Opponent: has a team link, kept so its text can be read below
+            else:
+                links = _TEAM_LINK(cells[i])
+                if links:
+                    opponent_idx = i
+                    opponent_link = links[0]
 
         # Validate we found all required fields
         if None in (date_idx, opponent_idx, venue_idx, result_idx):
@@ -199,9 +236,8 @@ class StattoScraper(BaseScraper):
         venue_str = cell_texts[venue_idx].lower()
         result_str = cell_texts[result_idx]
 
-        # Get opponent name from link
-        opponent_link = cells[opponent_idx].find("a")
-        opponent = opponent_link.get_text(strip=True) if opponent_link else cell_texts[opponent_idx]
+        # Get opponent name from the team link found above
+        opponent = element_text(opponent_link) or cell_texts[opponent_idx]
 
         # Parse date
         match_date = self._parse_date(date_str, year_hint)
@@ -228,3 +264,6 @@ class StattoScraper(BaseScraper):
             source=self.SOURCE_NAME,
             source_match_id=f"{match_date.isoformat()}_{opponent}",
         )
+
+
+_COMPETITION_EXACT = exact_lookup(StattoScraper.COMPETITION_MAP)
@@ -2,22 +2,71 @@
 
 import logging
 import re
-from datetime import datetime
+from datetime import date
 from typing import Optional
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from models.match import Match
-from scrapers.base import BaseScraper
+from scrapers.base import (
+    ROW_CELLS,
+    TABLE_ROWS,
+    TABLES,
+    BaseScraper,
+    element_text,
+    exact_lookup,
+)
+from utils.date_utils import parse_dmy_date
 from utils.http_client import HttpClient
 from utils.season_utils import format_season
 
 logger = logging.getLogger(__name__)
 
+# Compiled once rather than looked up in re's cache on every row
+_SCORE_RE = re.compile(r"(\d+)\s*[:|-]\s*(\d+)")
+_SCORE_IN_TEXT_RE = re.compile(r"\d+[:-]\d+")
+_RANK_RE = re.compile(r"\(\d+\.\)")
+
+# Day name prefixes on fixture dates (e.g. 'Sat 05/08/2017')
+_DAY_NAMES = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+
+# Only the first team link in a cell is used, so only that one is returned
+_TEAM_LINK = etree.XPath(
+    "(.//a[contains(@href, '/verein/') or contains(@href, '/teams/')])[1]"
+)
+
+# Summary/navigation text that isn't a competition, matched in a single pass
+_SKIP_TERMS = (
+    "overall balance", "home record", "away record",
+    "table section", "matches", "ranking", "club",
+    "filter by",
+)
+_SKIP_TERMS_RE = re.compile("|".join(re.escape(term) for term in _SKIP_TERMS))
+
+
+def _split_score(text: str) -> Optional[tuple[int, int]]:
+    """
+    Split a cell that is exactly a score such as '2:1' or '2-1'.
+
+    Uses string methods rather than a regex, since this runs on every row.
+    Returns None if the text is anything else.
+    """
+    sep = text.find(":")
+    if sep == -1:
+        sep = text.find("-")
+    if sep <= 0:
+        return None
+    home, away = text[:sep], text[sep + 1:]
+    if home.isdecimal() and away.isdecimal():
+        return int(home), int(away)
+    return None
+
 
 class TransfermarktScraper(BaseScraper):
     """Scraper for Transfermarkt historical match data."""
 
+    __slots__ = ()
+
     SOURCE_NAME = "transfermarkt"
     MIN_SEASON = 1910
     MAX_SEASON = 2026
@@ -54,35 +103,29 @@ class TransfermarktScraper(BaseScraper):
 
     def _get_season_url(self, start_year: int) -> str:
         """Get the URL for a season's fixtures."""
-        return f"{self.BASE_URL}/{self.TEAM_SLUG}/spielplan/verein/{self.TEAM_ID}/saison_id/{start_year}"
-
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
+        url = self._url_cache.get(start_year)
+        if url is None:
+            url = self._url_cache[start_year] = (
+                f"{self.BASE_URL}/{self.TEAM_SLUG}/spielplan/verein/{self.TEAM_ID}/saison_id/{start_year}"
+            )
+        return url
+
+    def _parse_date(self, date_str: str) -> Optional[date]:
         """Parse date from Transfermarkt format (e.g., 'Sat 05/08/2017')."""
+        # Remove day name prefix so equal dates share one cache entry
         date_str = date_str.strip()
-
-        # Remove day name prefix
-        date_str = re.sub(r"^(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s+", "", date_str)
-
-        formats = [
-            "%d/%m/%Y",
-            "%d/%m/%y",
-            "%d.%m.%Y",
-            "%d.%m.%y",
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-
-        logger.warning(f"Cannot parse date: {date_str}")
-        return None
+        if date_str[:3] in _DAY_NAMES and date_str[3:4].isspace():
+            date_str = date_str[3:].lstrip()
+        try:
+            return parse_dmy_date(date_str)
+        except ValueError:
+            logger.warning(f"Cannot parse date: {date_str}")
+            return None
 
     def _parse_score(self, score_str: str) -> tuple[int, int]:
         """Parse score from format like '2:1' or '2-1'."""
         score_str = score_str.strip()
-        match = re.search(r"(\d+)\s*[:|-]\s*(\d+)", score_str)
+        match = _SCORE_RE.search(score_str)
         if match:
             return int(match.group(1)), int(match.group(2))
         raise ValueError(f"Cannot parse score: {score_str}")
@@ -102,13 +145,13 @@ class TransfermarktScraper(BaseScraper):
         """Normalize competition name. Returns None for non-competition text."""
         comp_lower = comp.strip().lower()
 
+        # Most names match a key exactly; only scan for substrings on a miss
+        exact = _COMPETITION_EXACT.get(comp_lower)
+        if exact is not None:
+            return exact
+
         # Skip summary/navigation text that isn't a competition
-        skip_terms = [
-            "overall balance", "home record", "away record",
-            "table section", "matches", "ranking", "club",
-            "filter by"
-        ]
-        if any(term in comp_lower for term in skip_terms):
+        if _SKIP_TERMS_RE.search(comp_lower):
             return None
 
         for key, value in self.COMPETITION_MAP.items():
@@ -122,37 +165,46 @@ class TransfermarktScraper(BaseScraper):
 
     def _clean_opponent_name(self, name: str) -> str:
         """Remove ranking info from opponent name (e.g., 'Fleetwood(19.)' -> 'Fleetwood')."""
-        return re.sub(r"\s*\(\d+\.\)\s*$", "", name).strip()
-
-    def _is_fixtures_table(self, table) -> bool:
-        """Check if a table contains fixture data."""
-        rows = table.find_all("tr")
-        if len(rows) < 2:
+        name = name.rstrip()
+        # Fixed "(NN.)" suffix, so slice it off rather than running a regex
+        if name.endswith(".)"):
+            start = name.rfind("(")
+            if start != -1 and name[start + 1:-2].isdecimal():
+                name = name[:start]
+        return name.strip()
+
+    def _table_grid(self, table) -> list[tuple[list, list[str]]]:
+        """
+        Get each row of a table as its cells and their stripped texts.
+
+        Built once per table and shared by the fixtures check, the
+        competition scan and row parsing, so no cell's text is read twice.
+        """
+        grid = []
+        for row in TABLE_ROWS(table):
+            cells = ROW_CELLS(row)
+            grid.append((cells, [element_text(c) for c in cells]))
+        return grid
+
+    def _is_fixtures_table(self, grid: list) -> bool:
+        """Check if a table's rows contain fixture data."""
+        if len(grid) < 2:
             return False
 
-        header_row = rows[0]
-        header_cells = header_row.find_all(["td", "th"])
-        header_texts = [c.get_text(strip=True).lower() for c in header_cells]
+        header_texts = [text.lower() for text in grid[0][1]]
 
         # A fixtures table has Date and Venue columns
         return "date" in header_texts or "venue" in header_texts
 
-    def _extract_competitions_from_summary(self, soup) -> list[str]:
-        """Extract competition names from the summary table."""
+    def _extract_competitions(self, grid: list) -> list[str]:
+        """Extract competition names from a table's single-cell rows."""
         competitions = []
 
-        # Find the summary table (usually first table with competition stats)
-        for table in soup.find_all("table"):
-            rows = table.find_all("tr")
-
-            # Look for single-cell rows with competition names
-            for row in rows:
-                cells = row.find_all(["td", "th"])
-                if len(cells) == 1:
-                    text = cells[0].get_text(strip=True)
-                    normalized = self._normalize_competition(text)
-                    if normalized:
-                        competitions.append(normalized)
+        for _, texts in grid:
+            if len(texts) == 1:
+                normalized = self._normalize_competition(texts[0])
+                if normalized:
+                    competitions.append(normalized)
 
         return competitions
 
@@ -164,27 +216,31 @@ class TransfermarktScraper(BaseScraper):
         logger.info(f"Fetching {season} from Transfermarkt")
 
         try:
-            html = self.http_client.get_text(url)
+            html = self.http_client.get_text(url, max_age=self._cache_max_age(start_year))
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             return []
 
-        soup = BeautifulSoup(html, "lxml")
-        matches = []
+        root = self._parse_page(html, season)
+        if root is None:
+            return []
 
-        # First, extract the list of competitions from the summary table
-        competitions = self._extract_competitions_from_summary(soup)
-        logger.debug(f"Found competitions: {competitions}")
+        matches = []
 
-        # Find all fixtures tables
+        # Walk the tables once, collecting competition names (usually from
+        # the summary table) and the fixtures tables with their rows
+        competitions = []
         fixtures_tables = []
-        for table in soup.find_all("table"):
-            if self._is_fixtures_table(table):
-                fixtures_tables.append(table)
+        for table in TABLES(root):
+            grid = self._table_grid(table)
+            competitions.extend(self._extract_competitions(grid))
+            if self._is_fixtures_table(grid):
+                fixtures_tables.append(grid)
+        logger.debug(f"Found competitions: {competitions}")
 
         # Match each fixtures table to a competition
         # The order typically matches: first fixtures table = first competition, etc.
-        for i, table in enumerate(fixtures_tables):
+        for i, grid in enumerate(fixtures_tables):
             # Determine competition for this table
             if i < len(competitions):
                 competition = competitions[i]
@@ -192,24 +248,21 @@ class TransfermarktScraper(BaseScraper):
                 competition = "Unknown"
 
             # Parse this table's matches
-            table_matches = self._parse_fixtures_table(table, competition, season)
+            table_matches = self._parse_fixtures_table(grid, competition, season)
             matches.extend(table_matches)
 
         logger.info(f"Found {len(matches)} matches for {season}")
         return matches
 
-    def _parse_fixtures_table(self, table, competition: str, season: str) -> list[Match]:
-        """Parse a fixtures table into Match objects."""
+    def _parse_fixtures_table(self, grid: list, competition: str, season: str) -> list[Match]:
+        """Parse a fixtures table's rows (from _table_grid) into Match objects."""
         matches = []
-        rows = table.find_all("tr")
 
-        if len(rows) < 2:
+        if len(grid) < 2:
             return matches
 
         # Find column indices from header
-        header_row = rows[0]
-        header_cells = header_row.find_all(["td", "th"])
-        header_texts = [c.get_text(strip=True).lower() for c in header_cells]
+        header_texts = [text.lower() for text in grid[0][1]]
 
         col_indices = {}
         for i, text in enumerate(header_texts):
@@ -225,23 +278,34 @@ class TransfermarktScraper(BaseScraper):
                 col_indices["attendance"] = i
 
         # Parse each row
-        for row in rows[1:]:
-            cells = row.find_all("td")
+        for row_cells, row_texts in grid[1:]:
+            # Match columns are counted over <td> cells only
+            cells = []
+            cell_texts = []
+            for cell, text in zip(row_cells, row_texts):
+                if cell.tag == "td":
+                    cells.append(cell)
+                    cell_texts.append(text)
             if len(cells) < 5:
                 continue
 
-            match = self._parse_match_row(cells, col_indices, competition, season)
+            match = self._parse_match_row(
+                cells, cell_texts, col_indices, competition, season
+            )
             if match:
                 matches.append(match)
 
         return matches
 
     def _parse_match_row(
-        self, cells: list, col_indices: dict, competition: str, season: str
+        self,
+        cells: list,
+        cell_texts: list[str],
+        col_indices: dict,
+        competition: str,
+        season: str,
     ) -> Optional[Match]:
-        """Parse a table row into a Match object."""
-        cell_texts = [c.get_text(strip=True) for c in cells]
-
+        """Parse a table row (its <td> cells and their texts) into a Match object."""
         # Get date
         date_idx = col_indices.get("date", 1)
         if date_idx >= len(cell_texts):
@@ -255,26 +319,25 @@ class TransfermarktScraper(BaseScraper):
         venue_idx = col_indices.get("venue", 3)
         if venue_idx >= len(cell_texts):
             return None
-        venue_str = cell_texts[venue_idx].strip().upper()
-        if venue_str not in ("H", "A"):
+        venue = cell_texts[venue_idx].upper()
+        if venue not in ("H", "A"):
             return None
-        venue = venue_str
 
         # Get opponent - look for cell with team link
         opponent = None
         for cell in cells:
-            link = cell.find("a", href=re.compile(r"/verein/|/teams/"))
-            if link:
-                opponent = link.get_text(strip=True)
+            links = _TEAM_LINK(cell)
+            if links:
+                opponent = element_text(links[0])
                 break
 
         if not opponent:
             # Fall back to looking for text after ranking pattern
             for i, text in enumerate(cell_texts):
-                if re.match(r"\(\d+\.\)", text) or text == "":
+                if _RANK_RE.match(text) or text == "":
                     for j in range(i + 1, len(cell_texts)):
                         candidate = cell_texts[j]
-                        if candidate and not re.match(r"^\d+[:-]\d+$", candidate):
+                        if candidate and _split_score(candidate) is None:
                             opponent = candidate
                             break
                     break
@@ -284,25 +347,30 @@ class TransfermarktScraper(BaseScraper):
 
         opponent = self._clean_opponent_name(opponent)
 
-        # Get result - search for score pattern
+        # Get result - usually the result column holds exactly the score
+        score = None
         result_str = None
         result_idx = col_indices.get("result", -1)
         if result_idx >= 0 and result_idx < len(cell_texts):
             result_str = cell_texts[result_idx]
+            score = _split_score(result_str)
 
-        if not result_str or not re.search(r"\d+[:-]\d+", result_str):
-            for text in cell_texts:
-                if re.match(r"^\d+[:-]\d+$", text):
-                    result_str = text
-                    break
+        if score is None:
+            # Otherwise search the row for a score pattern
+            if not result_str or not _SCORE_IN_TEXT_RE.search(result_str):
+                for text in cell_texts:
+                    if _split_score(text) is not None:
+                        result_str = text
+                        break
 
-        if not result_str:
-            return None
+            if not result_str:
+                return None
 
-        try:
-            score1, score2 = self._parse_score(result_str)
-        except ValueError:
-            return None
+            try:
+                score = self._parse_score(result_str)
+            except ValueError:
+                return None
+        score1, score2 = score
 
         # Determine goals from Southend's perspective
         if venue == "H":
@@ -328,3 +396,6 @@ class TransfermarktScraper(BaseScraper):
             source=self.SOURCE_NAME,
             source_match_id=f"{match_date.isoformat()}_{opponent}",
         )
+
+
+_COMPETITION_EXACT = exact_lookup(TransfermarktScraper.COMPETITION_MAP)
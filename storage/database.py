@@ -1,34 +1,206 @@
-import json
 import sqlite3
-from contextlib import contextmanager
+from contextlib import AbstractContextManager, contextmanager
 from datetime import date
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, Optional
 
 from models.match import Match
+from utils.json_utils import dumps, loads
 
 
-class Database:
-    """SQLite storage layer for match data."""
+def _convert_date(value: bytes) -> date:
+    """Convert a stored ISO date from a DATE column back into a date."""
+    return date.fromisoformat(value.decode())
+
+
+# Match dates are stored as ISO text. sqlite3 calls these for date parameters
+# and for columns declared DATE (connections use PARSE_DECLTYPES).
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter("DATE", _convert_date)
+
+# SQL statements, built once at import. Every call passes the same string,
+# so sqlite3's per-connection statement cache reuses the compiled statement.
+
+_COLUMNS = """
+    date, opposition, venue, goals_for, goals_against,
+    competition, season, attendance, referee, scorers, lineup,
+    source, source_match_id, detail_fetched
+"""
+
+_INSERT_SQL = f"""
+    INSERT INTO matches ({_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Shared by upsert_match and upsert_many
+_UPSERT_SQL = _INSERT_SQL + """
+    ON CONFLICT(date, opposition, competition) DO UPDATE SET
+        venue = excluded.venue,
+        goals_for = excluded.goals_for,
+        goals_against = excluded.goals_against,
+        season = excluded.season,
+        attendance = COALESCE(excluded.attendance, attendance),
+        referee = COALESCE(excluded.referee, referee),
+        scorers = COALESCE(excluded.scorers, scorers),
+        lineup = COALESCE(excluded.lineup, lineup),
+        source = CASE WHEN excluded.source != '' THEN excluded.source ELSE source END,
+        source_match_id = COALESCE(excluded.source_match_id, source_match_id),
+        detail_fetched = MAX(detail_fetched, excluded.detail_fetched),
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_SELECT_BY_ID_SQL = "SELECT * FROM matches WHERE id = ?"
+
+_SELECT_BY_SEASON_SQL = "SELECT * FROM matches WHERE season = ? ORDER BY date"
+
+_SELECT_ALL_SQL = "SELECT * FROM matches ORDER BY date"
+
+# The date is cast so it stays an ISO string rather than being converted.
+# ORDER BY names the table column, not the cast alias, so idx_matches_date
+# serves the ordering.
+_SELECT_BY_DECADE_SQL = """
+    SELECT CAST(strftime('%Y', date) AS INTEGER) / 10 * 10 AS decade,
+           CAST(date AS TEXT) AS date, opposition, venue, goals_for, goals_against,
+           CASE WHEN goals_for > goals_against THEN 'W'
+                WHEN goals_for < goals_against THEN 'L'
+                ELSE 'D' END AS result,
+           competition, season
+    FROM matches ORDER BY matches.date
+"""
+
+_SELECT_NEEDING_ENRICHMENT_SQL = """
+    SELECT * FROM matches
+    WHERE detail_fetched = 0 AND source_match_id IS NOT NULL
+    ORDER BY date
+"""
+
+_SELECT_NEEDING_ENRICHMENT_BY_SOURCE_SQL = """
+    SELECT * FROM matches
+    WHERE detail_fetched = 0 AND source = ? AND source_match_id IS NOT NULL
+    ORDER BY date
+"""
+
+_SELECT_ENRICHMENT_TARGETS_SQL = """
+    SELECT id, source, source_match_id FROM matches
+    WHERE detail_fetched = 0 AND source_match_id IS NOT NULL
+    ORDER BY date
+"""
+
+_SELECT_ENRICHMENT_TARGETS_BY_SOURCE_SQL = """
+    SELECT id, source, source_match_id FROM matches
+    WHERE detail_fetched = 0 AND source = ? AND source_match_id IS NOT NULL
+    ORDER BY date
+"""
+
+_COUNT_SQL = "SELECT COUNT(*) FROM matches"
+
+_SEASON_SUMMARY_SQL = """
+    SELECT season, COUNT(*) as matches,
+           SUM(CASE WHEN goals_for > goals_against THEN 1 ELSE 0 END) as wins,
+           SUM(CASE WHEN goals_for = goals_against THEN 1 ELSE 0 END) as draws,
+           SUM(CASE WHEN goals_for < goals_against THEN 1 ELSE 0 END) as losses,
+           SUM(goals_for) as scored, SUM(goals_against) as conceded
+    FROM matches GROUP BY season ORDER BY season
+"""
+
+
+def _match_to_row(match: Match) -> tuple:
+    """Convert a Match into the INSERT parameter tuple (column order of _COLUMNS)."""
+    return (
+        match.date,
+        match.opposition,
+        match.venue,
+        match.goals_for,
+        match.goals_against,
+        match.competition,
+        match.season,
+        match.attendance,
+        match.referee,
+        dumps(match.scorers) if match.scorers else None,
+        dumps(match.lineup) if match.lineup else None,
+        match.source,
+        match.source_match_id,
+        1 if match.detail_fetched else 0,
+    )
+
+
+class Database(AbstractContextManager):
+    """
+    SQLite storage layer for match data.
+
+    A single connection is opened on first use and kept until close(), so
+    chained operations reuse it. Use as a context manager to close it.
+    """
 
     def __init__(self, db_path: str | Path = "data/matches.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
         self._init_schema()
 
-    @contextmanager
-    def _connection(self) -> Iterator[sqlite3.Connection]:
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection if it is open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with per-connection pragmas applied."""
+        # Autocommit at the driver level; _connection issues BEGIN/COMMIT
+        # itself. The connection may be handed between threads, but is only
+        # used by one at a time.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
         conn.row_factory = sqlite3.Row
+        # WAL is persistent in the database file; it keeps commits cheap
+        # by appending to the log instead of rewriting a rollback journal.
+        # It can't be switched inside a transaction, so set it here.
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Safe in WAL mode and avoids an fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # 64 MiB page cache (negative values are in KiB)
+        conn.execute("PRAGMA cache_size=-65536")
+        # Memory-map up to 256 MiB of the file instead of read() calls
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+
+    @contextmanager
+    def _connection(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager yielding the shared connection within a transaction.
+
+        The connection runs in autocommit mode, so the transaction is begun
+        and committed (or rolled back) explicitly here.
+
+        Args:
+            immediate: Take the write lock up front with BEGIN IMMEDIATE, so a
+                bulk write cannot fail part-way on upgrading a read lock
+        """
+        if self._conn is None:
+            self._conn = self._connect()
+        conn = self._conn
+        # Nested uses join the outer transaction, which commits for them
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
         try:
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
+            conn.execute("COMMIT")
+        except BaseException:
+            # SQLite may already have rolled back itself (e.g. SQLITE_FULL);
+            # a second ROLLBACK would fail and mask the original error
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
             raise
-        finally:
-            conn.close()
 
     def _init_schema(self) -> None:
         """Initialize the database schema."""
@@ -36,7 +208,7 @@ class Database:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS matches (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
+                    date DATE NOT NULL,
                     opposition TEXT NOT NULL,
                     venue TEXT NOT NULL CHECK (venue IN ('H', 'A', 'N')),
                     goals_for INTEGER NOT NULL,
@@ -64,145 +236,120 @@ class Database:
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_matches_opposition ON matches(opposition)
             """)
+            # Partial index covering only matches still awaiting enrichment,
+            # so those lookups don't scan the table and come out in date order
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_matches_enrich ON matches(source, date)
+                WHERE detail_fetched = 0 AND source_match_id IS NOT NULL
+            """)
 
     def insert_match(self, match: Match) -> int:
         """Insert a match into the database. Returns the row ID."""
         with self._connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO matches (
-                    date, opposition, venue, goals_for, goals_against,
-                    competition, season, attendance, referee, scorers, lineup,
-                    source, source_match_id, detail_fetched
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    match.date.isoformat(),
-                    match.opposition,
-                    match.venue,
-                    match.goals_for,
-                    match.goals_against,
-                    match.competition,
-                    match.season,
-                    match.attendance,
-                    match.referee,
-                    json.dumps(match.scorers) if match.scorers else None,
-                    json.dumps(match.lineup) if match.lineup else None,
-                    match.source,
-                    match.source_match_id,
-                    1 if match.detail_fetched else 0,
-                ),
-            )
+            cursor = conn.execute(_INSERT_SQL, _match_to_row(match))
             return cursor.lastrowid
 
     def upsert_match(self, match: Match) -> int:
         """Insert or update a match. Returns the row ID."""
         with self._connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO matches (
-                    date, opposition, venue, goals_for, goals_against,
-                    competition, season, attendance, referee, scorers, lineup,
-                    source, source_match_id, detail_fetched
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(date, opposition, competition) DO UPDATE SET
-                    venue = excluded.venue,
-                    goals_for = excluded.goals_for,
-                    goals_against = excluded.goals_against,
-                    season = excluded.season,
-                    attendance = COALESCE(excluded.attendance, attendance),
-                    referee = COALESCE(excluded.referee, referee),
-                    scorers = COALESCE(excluded.scorers, scorers),
-                    lineup = COALESCE(excluded.lineup, lineup),
-                    source = CASE WHEN excluded.source != '' THEN excluded.source ELSE source END,
-                    source_match_id = COALESCE(excluded.source_match_id, source_match_id),
-                    detail_fetched = MAX(detail_fetched, excluded.detail_fetched),
-                    updated_at = CURRENT_TIMESTAMP
-            """,
-                (
-                    match.date.isoformat(),
-                    match.opposition,
-                    match.venue,
-                    match.goals_for,
-                    match.goals_against,
-                    match.competition,
-                    match.season,
-                    match.attendance,
-                    match.referee,
-                    json.dumps(match.scorers) if match.scorers else None,
-                    json.dumps(match.lineup) if match.lineup else None,
-                    match.source,
-                    match.source_match_id,
-                    1 if match.detail_fetched else 0,
-                ),
-            )
+            cursor = conn.execute(_UPSERT_SQL, _match_to_row(match))
             return cursor.lastrowid
 
+    def upsert_many(self, matches: Iterable[Match]) -> int:
+        """
+        Insert or update many matches in a single transaction.
+
+        Returns the number of matches written.
+        """
+        with self._connection(immediate=True) as conn:
+            cursor = conn.executemany(
+                _UPSERT_SQL, (_match_to_row(m) for m in matches)
+            )
+            return cursor.rowcount
+
     def get_match(self, match_id: int) -> Optional[Match]:
         """Get a match by ID."""
         with self._connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM matches WHERE id = ?", (match_id,)
-            ).fetchone()
+            row = conn.execute(_SELECT_BY_ID_SQL, (match_id,)).fetchone()
             return self._row_to_match(row) if row else None
 
     def get_matches_by_season(self, season: str) -> list[Match]:
         """Get all matches for a season."""
         with self._connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM matches WHERE season = ? ORDER BY date",
-                (season,),
-            ).fetchall()
+            rows = conn.execute(_SELECT_BY_SEASON_SQL, (season,)).fetchall()
             return [self._row_to_match(row) for row in rows]
 
     def get_all_matches(self) -> list[Match]:
         """Get all matches ordered by date."""
+        return list(self.iter_matches())
+
+    def iter_matches(self) -> Iterator[Match]:
+        """Yield all matches ordered by date without loading them all at once."""
         with self._connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM matches ORDER BY date"
-            ).fetchall()
-            return [self._row_to_match(row) for row in rows]
+            for row in conn.execute(_SELECT_ALL_SQL):
+                yield self._row_to_match(row)
+
+    def iter_matches_by_decade(self) -> Iterator[dict]:
+        """
+        Yield match rows ordered by date, for export grouped by decade.
+
+        Each row is a dict with a ``decade`` key (e.g. 1920) plus the date
+        as an ISO string, the core match columns and the W/D/L ``result``.
+        Ordering by date alone keeps each decade contiguous and lets SQLite
+        walk idx_matches_date instead of sorting into a temp B-tree.
+        """
+        with self._connection() as conn:
+            for row in conn.execute(_SELECT_BY_DECADE_SQL):
+                yield dict(row)
 
     def get_matches_needing_enrichment(self, source: Optional[str] = None) -> list[Match]:
         """Get matches that haven't had detail fetched."""
         with self._connection() as conn:
             if source:
                 rows = conn.execute(
-                    """SELECT * FROM matches
-                       WHERE detail_fetched = 0 AND source = ? AND source_match_id IS NOT NULL
-                       ORDER BY date""",
-                    (source,),
+                    _SELECT_NEEDING_ENRICHMENT_BY_SOURCE_SQL, (source,)
                 ).fetchall()
             else:
-                rows = conn.execute(
-                    """SELECT * FROM matches
-                       WHERE detail_fetched = 0 AND source_match_id IS NOT NULL
-                       ORDER BY date"""
-                ).fetchall()
+                rows = conn.execute(_SELECT_NEEDING_ENRICHMENT_SQL).fetchall()
             return [self._row_to_match(row) for row in rows]
 
+    def get_enrichment_targets(
+        self, source: Optional[str] = None
+    ) -> list[tuple[int, str, str]]:
+        """
+        Get (id, source, source_match_id) for matches needing detail fetched.
+
+        A narrow version of get_matches_needing_enrichment for callers that
+        only need to locate each match, so no Match objects are built.
+        """
+        with self._connection() as conn:
+            if source:
+                cursor = conn.execute(
+                    _SELECT_ENRICHMENT_TARGETS_BY_SOURCE_SQL, (source,)
+                )
+            else:
+                cursor = conn.execute(_SELECT_ENRICHMENT_TARGETS_SQL)
+            return [tuple(row) for row in cursor]
+
     def get_match_count(self) -> int:
         """Get total number of matches."""
         with self._connection() as conn:
-            return conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+            return conn.execute(_COUNT_SQL).fetchone()[0]
 
     def get_season_summary(self) -> list[dict]:
         """Get a summary of matches per season."""
         with self._connection() as conn:
-            rows = conn.execute("""
-                SELECT season, COUNT(*) as matches,
-                       SUM(CASE WHEN goals_for > goals_against THEN 1 ELSE 0 END) as wins,
-                       SUM(CASE WHEN goals_for = goals_against THEN 1 ELSE 0 END) as draws,
-                       SUM(CASE WHEN goals_for < goals_against THEN 1 ELSE 0 END) as losses,
-                       SUM(goals_for) as scored, SUM(goals_against) as conceded
-                FROM matches GROUP BY season ORDER BY season
-            """).fetchall()
+            rows = conn.execute(_SEASON_SUMMARY_SQL).fetchall()
             return [dict(row) for row in rows]
 
     def _row_to_match(self, row: sqlite3.Row) -> Match:
         """Convert a database row to a Match object."""
+        match_date = row["date"]
+        if isinstance(match_date, str):
+            # Databases created before the column was declared DATE hold text
+            match_date = date.fromisoformat(match_date)
         return Match(
-            date=date.fromisoformat(row["date"]),
+            date=match_date,
             opposition=row["opposition"],
             venue=row["venue"],
             goals_for=row["goals_for"],
@@ -211,8 +358,8 @@ class Database:
             season=row["season"],
             attendance=row["attendance"],
             referee=row["referee"],
-            scorers=json.loads(row["scorers"]) if row["scorers"] else None,
-            lineup=json.loads(row["lineup"]) if row["lineup"] else None,
+            scorers=loads(row["scorers"]) if row["scorers"] else None,
+            lineup=loads(row["lineup"]) if row["lineup"] else None,
             source=row["source"] or "",
             source_match_id=row["source_match_id"],
             detail_fetched=bool(row["detail_fetched"]),
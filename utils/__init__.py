@@ -1,4 +1,6 @@
-from .http_client import HttpClient
+from .date_utils import parse_dmy_date
+from .http_client import HttpClient, create_session
+from .json_utils import dumps, dumps_bytes, loads
 from .season_utils import (
     format_season,
     get_season_from_date,
@@ -8,8 +10,13 @@ from .season_utils import (
 
 __all__ = [
     "HttpClient",
+    "create_session",
+    "dumps",
+    "dumps_bytes",
     "format_season",
     "get_season_from_date",
     "iter_seasons",
+    "loads",
+    "parse_dmy_date",
     "parse_season",
 ]
@@ -0,0 +1,50 @@
+"""Utilities for parsing match dates."""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+# Day-first formats used by the scraped sources, keyed by
+# (separator, whether the year has four digits)
+DMY_FORMATS = {
+    ("/", True): "%d/%m/%Y",  # 28/08/1993
+    ("/", False): "%d/%m/%y",  # 28/08/93
+    (".", True): "%d.%m.%Y",  # 28.08.1993
+    (".", False): "%d.%m.%y",  # 28.08.93
+}
+
+
+@lru_cache(maxsize=4096)
+def parse_dmy_date(date_str: str) -> date:
+    """
+    Parse a day-first date string such as "28/08/1993" or "28.08.93".
+
+    Zero-padded four-digit-year dates are sliced directly; otherwise the
+    format is picked from the separator and the length of the year, so
+    strptime runs at most once. Results are memoized, since a season only
+    has a few dozen distinct match dates and the same strings recur across
+    scrapes.
+
+    Raises:
+        ValueError: If the string matches none of DMY_FORMATS
+    """
+    sep = "/" if "/" in date_str else "."
+
+    # Zero-padded DD/MM/YYYY is by far the commonest shape, and slicing out
+    # the fields is much cheaper than strptime interpreting a format
+    if (
+        len(date_str) == 10
+        and date_str[2] == sep
+        and date_str[5] == sep
+        and (date_str[:2] + date_str[3:5] + date_str[6:]).isdecimal()
+    ):
+        try:
+            return date(int(date_str[6:]), int(date_str[3:5]), int(date_str[:2]))
+        except ValueError:
+            raise ValueError(f"Cannot parse date: {date_str}") from None
+
+    year = date_str.rpartition(sep)[2]
+    fmt = DMY_FORMATS[sep, len(year) == 4]
+    try:
+        return datetime.strptime(date_str, fmt).date()
+    except ValueError:
+        raise ValueError(f"Cannot parse date: {date_str}") from None
@@ -1,16 +1,64 @@
 """Rate-limited HTTP client for web scraping."""
 
+import gzip
+import hashlib
+import json
 import logging
+import os
 import random
+import shutil
+import tempfile
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Every content encoding urllib3 can decode here (br only if brotli is installed)
+_ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def create_session(
+    max_retries: int = 3, backoff_factor: float = 1.0, pool_size: int = 16
+) -> requests.Session:
+    """
+    Create a requests session with retrying, keep-alive connection pools.
+
+    A single session can be shared between several HttpClient instances so
+    that all scrapers reuse the same TCP/TLS connections.
+
+    Args:
+        max_retries: Maximum number of retries for failed requests
+        backoff_factor: Factor for exponential backoff between retries
+        pool_size: Number of hosts, and keep-alive connections per host, to pool
+    """
+    session = requests.Session()
+
+    # Configure retries
+    retry_strategy = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class HttpClient:
     """HTTP client with rate limiting and retry logic."""
@@ -29,6 +77,9 @@ class HttpClient:
         timeout: int = 30,
         max_retries: int = 3,
         backoff_factor: float = 1.0,
+        session: Optional[requests.Session] = None,
+        cache_dir: Optional[str | Path] = None,
+        disable_compression: bool = False,
     ):
         """
         Initialize the HTTP client.
@@ -38,23 +89,26 @@ class HttpClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retries for failed requests
             backoff_factor: Factor for exponential backoff between retries
+            session: Shared session to send requests through. If None, a new
+                one is created using max_retries and backoff_factor.
+            cache_dir: Directory for caching get_text responses on disk.
+                If None, responses are never cached.
+            disable_compression: Ask for uncompressed responses, for sites
+                that mishandle compressed transfers
         """
         self.rate_limit = rate_limit
         self.timeout = timeout
-        self.last_request_time: float = 0
+        self.accept_encoding = "identity" if disable_compression else _ACCEPT_ENCODING
+        # Earliest time (time.monotonic) the next request to each host may start
+        self._host_next_ready: dict[str, float] = {}
+        # Serializes rate-limit bookkeeping when the client is shared by threads
+        self._rate_lock = threading.Lock()
 
-        self.session = requests.Session()
+        self.session = session or create_session(max_retries, backoff_factor)
 
-        # Configure retries
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
 
     def _get_headers(self) -> dict:
         """Get headers with a random user agent."""
@@ -62,17 +116,31 @@ class HttpClient:
             "User-Agent": random.choice(self.USER_AGENTS),
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-GB,en;q=0.9",
-            "Accept-Encoding": "identity",  # Some older sites have compression issues
+            "Accept-Encoding": self.accept_encoding,
             "Connection": "keep-alive",
         }
 
-    def _wait_for_rate_limit(self) -> None:
-        """Wait if necessary to respect rate limit."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            wait_time = self.rate_limit - elapsed
-            # Add some jitter to appear more human
-            wait_time += random.uniform(0, 0.5)
+    def _wait_for_rate_limit(self, url: str) -> None:
+        """
+        Wait if necessary to respect the rate limit for the URL's host.
+
+        Each caller reserves the next free slot for the host under the lock
+        and then sleeps outside it, so concurrent requests to one host are
+        spaced out while requests to different hosts don't wait at all.
+        """
+        host = urlsplit(url).netloc
+        with self._rate_lock:
+            now = time.monotonic()
+            start = self._host_next_ready.get(host, now)
+            if start > now:
+                # Add some jitter to appear more human
+                start += random.uniform(0, 0.5)
+            else:
+                start = now
+            self._host_next_ready[host] = start + self.rate_limit
+
+        wait_time = start - now
+        if wait_time > 0:
             logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
             time.sleep(wait_time)
 
@@ -90,14 +158,13 @@ class HttpClient:
         Raises:
             requests.RequestException: If the request fails after retries
         """
-        self._wait_for_rate_limit()
-
         headers = self._get_headers()
         if "headers" in kwargs:
             headers.update(kwargs.pop("headers"))
 
+        self._wait_for_rate_limit(url)
+
         logger.debug(f"Fetching: {url}")
-        self.last_request_time = time.time()
 
         response = self.session.get(
             url,
@@ -109,9 +176,146 @@ class HttpClient:
 
         return response
 
-    def get_text(self, url: str, **kwargs) -> str:
-        """Fetch URL and return response text."""
-        return self.get(url, **kwargs).text
+    def _cache_path(self, url: str) -> Path:
+        """Get the cache file path (without suffix) for a URL."""
+        key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / key
+
+    @staticmethod
+    def _is_fresh(path: Path, max_age: Optional[float]) -> bool:
+        """Check if a cache file exists and is younger than max_age seconds."""
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return max_age is None or time.time() - mtime < max_age
+
+    def get_text(self, url: str, max_age: Optional[float] = None, **kwargs) -> str:
+        """
+        Fetch URL and return response text.
+
+        When the client has a cache_dir, responses (and 404s) are stored
+        gzip-compressed on disk and served from there while younger than
+        max_age. Once stale, a cached page is revalidated with its ETag or
+        Last-Modified date, so an unchanged page isn't downloaded again.
+
+        Args:
+            url: The URL to fetch
+            max_age: Seconds a cached response stays valid. None keeps it
+                forever, which suits seasons that have finished.
+            **kwargs: Additional arguments passed to get
+        """
+        if self.cache_dir is None:
+            return self.get(url, **kwargs).text
+
+        path = self._cache_path(url)
+        body_path = path.with_suffix(".txt.gz")
+        meta_path = path.with_suffix(".meta")
+        missing_path = path.with_suffix(".404")
+
+        if self._is_fresh(missing_path, max_age):
+            logger.debug(f"Cached 404: {url}")
+            raise requests.HTTPError(f"404 Client Error: Not Found (cached) for url: {url}")
+        if self._is_fresh(body_path, max_age):
+            text = self._read_cached(body_path)
+            if text is not None:
+                logger.debug(f"Cache hit: {url}")
+                return text
+
+        # Ask the server whether a stale cached copy is still current
+        extra_headers = kwargs.pop("headers", {})
+        headers = extra_headers
+        if body_path.exists():
+            headers = {**self._revalidation_headers(meta_path), **extra_headers}
+
+        try:
+            response = self.get(url, headers=headers, **kwargs)
+        except requests.HTTPError as e:
+            # Remember missing pages too, so they aren't requested every run
+            if e.response is not None and e.response.status_code == 404:
+                missing_path.touch()
+            raise
+
+        if response.status_code == 304:
+            text = self._read_cached(body_path)
+            if text is not None:
+                logger.debug(f"Not modified: {url}")
+                os.utime(body_path)
+                return text
+            # The cached copy is gone or unreadable, so fetch it unconditionally
+            response = self.get(url, headers=extra_headers, **kwargs)
+
+        text = response.text
+        self._write_atomic(body_path, gzip.compress(text.encode("utf-8")))
+        validators = {
+            key: response.headers[header]
+            for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+            if header in response.headers
+        }
+        if validators:
+            self._write_atomic(meta_path, json.dumps(validators).encode("utf-8"))
+        else:
+            meta_path.unlink(missing_ok=True)
+        missing_path.unlink(missing_ok=True)
+        return text
+
+    @staticmethod
+    def _read_cached(body_path: Path) -> Optional[str]:
+        """
+        Read a gzip-compressed cached response.
+
+        Returns None, and removes the file, if it is missing or unreadable
+        (e.g. truncated by an interrupted run), so the page is fetched again.
+        """
+        try:
+            data = body_path.read_bytes()
+            if not data:
+                # gzip.decompress() accepts b"", but even an empty page compresses to more
+                raise EOFError("empty file")
+            return gzip.decompress(data).decode("utf-8")
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Discarding unreadable cache file {body_path}: {e}")
+            body_path.unlink(missing_ok=True)
+            return None
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Write a cache file via a temporary file, so readers never see a partial one."""
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _revalidation_headers(meta_path: Path) -> dict:
+        """Build conditional request headers from a cached response's validators."""
+        try:
+            validators = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def get_many(self, urls: list[str], max_workers: int = 8, **kwargs) -> list[str]:
+        """
+        Fetch several URLs concurrently and return their texts in order.
+
+        Requests to the same host are still spaced by the rate limit; only
+        different hosts (and the network round trips) overlap.
+
+        Raises:
+            requests.RequestException: If any request fails
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda url: self.get_text(url, **kwargs), urls))
 
     def get_json(self, url: str, **kwargs) -> dict:
         """Fetch URL and return parsed JSON."""
@@ -120,6 +324,8 @@ class HttpClient:
     def download(self, url: str, path: str, **kwargs) -> None:
         """Download a file to the specified path."""
         response = self.get(url, stream=True, **kwargs)
-        with open(path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Let urllib3 decode a compressed transfer while copying
+        response.raw.decode_content = True
+        with response, open(path, "wb") as f:
+            # Copy in 1 MiB blocks rather than looping over small chunks
+            shutil.copyfileobj(response.raw, f, length=1024 * 1024)
@@ -0,0 +1,29 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: pip install sufc-history[fast]
+    orjson = None
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj) -> str:
+    """Serialize obj to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: str | bytes):
+    """Deserialize a JSON string or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
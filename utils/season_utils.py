@@ -1,6 +1,7 @@
 """Utilities for working with football seasons."""
 
 from datetime import date
+from functools import lru_cache
 from typing import Iterator
 
 
@@ -30,10 +31,13 @@ def parse_season(season: str) -> tuple[int, int]:
     return start_year, end_year
 
 
+@lru_cache(maxsize=512)
 def format_season(start_year: int, end_year: int | None = None) -> str:
     """
     Format start/end years into a season string.
 
+    Memoized, since the same few hundred seasons are formatted repeatedly.
+
     Examples:
         (1920, 1921) -> "1920-1921"
         (1920, None) -> "1920-1921"